@@ -5,16 +5,27 @@ Description : Main file of the Streamlit application.
 
 import streamlit as st
 
-from scripts.data_loader import download_and_load_data, merge_coordinates_with_elec
-from scripts.filters import apply_filters
+from config.settings import MAP_MAX_POINTS, TABLE_MAX_ROWS
+from scripts.background_loader import (
+    STAGES,
+    get_data_loader,
+    retry_failed_load,
+    stage_completed,
+)
+from scripts.filters import apply_filters, build_filter_spec
+from scripts.query_engine import PandasEngine
 from scripts.ui_components import (
     about,
     download_button,
     interactive_table,
+    loading_progress,
+    pending_section,
     setup_page,
     sidebar_filters,
+    summary_metrics,
 )
 from scripts.visualizations import (
+    MAP_COLUMNS,
     department_mayor_count_chart,
     gender_distribution_chart,
     mayors_map,
@@ -27,6 +38,9 @@ def main():
     Main entry point for the Streamlit application. This function orchestrates the various steps involved in setting up
     the application, loading the data, applying filters, and displaying the user interface with different sections and tabs.
 
+    Data is loaded in a background thread shared by every session: the page and sidebar render immediately, and each
+    section is filled in as soon as the loading stage it depends on has completed.
+
     The application allows the user to explore French elected officials data, with features such as:
     - Gender distribution.
     - Map of mayors.
@@ -55,22 +69,39 @@ def main():
     )
     st.markdown("---")
 
-    # Loading and processing data.
-    with st.spinner("⏳ Chargement des données..."):
-        df = download_and_load_data()
-        df = merge_coordinates_with_elec(df)
+    # Loading data in the background: sections render as stages complete.
+    loader = get_data_loader()
+    completed = loader.completed
+    summary = loader.summary
+    # Read the frames before the engine: they are only released once it is set.
+    frame = loader.merged_df if loader.merged_df is not None else loader.df
+    engine = loader.engine
+    if engine is None and frame is not None:
+        # Query the parsed data in memory until the configured engine is ready.
+        engine = PandasEngine(frame)
+    town_index, name_index = loader.town_index, loader.name_index
+
+    if loader.error:
+        st.error(loader.error)
+        # Drop the failed loader once, on retry: the rerun starts a new load.
+        st.button("🔄 Réessayer", on_click=retry_failed_load, args=(loader,))
+    elif completed < len(STAGES):
+        loading_progress(loader, completed)
 
     # Sidebar filters.
-    departments, gender, town, name = sidebar_filters(df)
-    filtered_df = apply_filters(df, departments, gender, town, name)
+    departments, gender, town, name = sidebar_filters(summary, town_index, name_index)
+    filters, _ = build_filter_spec(
+        departments, gender, town, name, town_index, name_index
+    )
+    if engine is not None:
+        summary = engine.summarize(filters)
+    elif departments or gender or town or name:
+        # The precomputed summary only describes the unfiltered dataset.
+        summary = None
 
     # Sum up.
     st.subheader("📌 Résumé")
-    col1, col2, col3 = st.columns(3)
-    col1.metric("Élus affichés", f"{len(filtered_df):,}")
-    col2.metric("Départements", filtered_df["code_du_departement"].nunique())
-    pct_femmes = filtered_df["code_sexe"].value_counts(normalize=True).get("F", 0) * 100
-    col3.metric("Femmes %", f"{pct_femmes:.1f} %")
+    summary_metrics(summary)
     st.markdown("---")
 
     # Creating tabs.
@@ -81,28 +112,60 @@ def main():
     # Map tab.
     with tab1:
         st.subheader("🗺️ Carte des maires")
-        mayors_map(filtered_df)
+        if engine is None or not stage_completed(completed, "merge"):
+            pending_section("La carte s'affichera après l'ajout des coordonnées.")
+        else:
+            map_df = apply_filters(
+                None,
+                departments,
+                gender,
+                town,
+                name,
+                engine,
+                town_index,
+                name_index,
+                columns=MAP_COLUMNS,
+                limit=MAP_MAX_POINTS,
+            )
+            mayors_map(map_df)
 
     # Visualisations tab.
     with tab2:
-        st.subheader("👥 Répartition hommes / femmes")
-        gender_distribution_chart(filtered_df)
-        st.markdown("---")
+        if engine is None:
+            pending_section("Les graphiques s'afficheront après la lecture des élus.")
+        else:
+            st.subheader("👥 Répartition hommes / femmes")
+            gender_distribution_chart(engine, filters)
+            st.markdown("---")
 
-        st.subheader("🏛️ Nombre de maires par département")
-        department_mayor_count_chart(filtered_df)
-        st.markdown("---")
+            st.subheader("🏛️ Nombre de maires par département")
+            department_mayor_count_chart(engine, filters)
+            st.markdown("---")
 
-        st.subheader("👔 Catégories socio-professionnelles les plus représentées")
-        profession_analysis_chart(filtered_df)
+            st.subheader("👔 Catégories socio-professionnelles les plus représentées")
+            profession_analysis_chart(engine, filters)
 
     # Result tab.
     with tab3:
         st.subheader("📋 Résultats filtrés")
-        with st.expander("🔍 Afficher les élus filtrés (tableau)"):
-            interactive_table(filtered_df)
-
-        download_button(filtered_df)
+        if engine is None:
+            pending_section("Le tableau s'affichera après la lecture des élus.")
+        else:
+            with st.expander("🔍 Afficher les élus filtrés (tableau)"):
+                table_df = apply_filters(
+                    None,
+                    departments,
+                    gender,
+                    town,
+                    name,
+                    engine,
+                    town_index,
+                    name_index,
+                    limit=TABLE_MAX_ROWS,
+                )
+                interactive_table(table_df, summary["total"])
+
+            download_button(engine.to_csv(filters))
 
     # About tab.
     with tab4:
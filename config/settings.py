@@ -3,12 +3,22 @@ Author : Anthony Morin
 Description : Application constants.
 """
 
+import os
+
 # URL of the dataset
 DATA_URL = "https://www.data.gouv.fr/fr/datasets/r/2876a346-d50c-4911-934e-19ee07b0e503"
 
 # URL for the coordinates of French communes
 TOWN_URL = "https://www.data.gouv.fr/fr/datasets/r/dbe8a621-a9c4-4bc3-9cae-be1699c5ff25"
 
+# Local copies of the datasets and precomputed summary shown at startup
+ELEC_PATH = "data/elus.csv"
+TOWN_PATH = "data/communes.csv"
+SUMMARY_PATH = "data/summary.json"
+
+# Seconds between two checks of the background data load
+LOADER_POLL_INTERVAL = 1.0
+
 # Column name constants (standardized for internal use)
 COL_DEPARTMENT_CODE = "code_du_departement"
 COL_DEPARTMENT_NAME = "libelle_du_departement"
@@ -39,6 +49,23 @@ MAP_RADIUS = 300
 MAP_RADIUS_MIN_PX = 3
 MAP_RADIUS_MAX_PX = 12
 
+# Query engine backend ("pandas" or "duckdb"), selected per deployment
+QUERY_ENGINE = os.environ.get("QUERY_ENGINE", "pandas")
+
+# DuckDB backend: Parquet snapshot of the merged dataset, threads and working memory
+PARQUET_PATH = "data/elus.parquet"
+DUCKDB_THREADS = int(os.environ.get("DUCKDB_THREADS", os.cpu_count() or 1))
+DUCKDB_MEMORY_LIMIT = os.environ.get("DUCKDB_MEMORY_LIMIT", "512MB")
+
+# Typo-tolerant search: minimum similarity score, suggestions and memoized lookups
+FUZZY_MIN_SCORE = 0.5
+FUZZY_MAX_SUGGESTIONS = 3
+FUZZY_CACHE_SIZE = 256
+
+# Rows fetched for the table and points drawn on the map on each rerun
+TABLE_MAX_ROWS = 10_000
+MAP_MAX_POINTS = 50_000
+
 # UI constants
 APP_ICON = "🗳️"
 APP_LAYOUT = "wide"
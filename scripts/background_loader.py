@@ -0,0 +1,187 @@
+"""
+Author : Anthony Morin
+Description : Loading data in the background, stage by stage.
+"""
+
+import threading
+
+import streamlit as st
+
+from config.settings import (
+    COL_NAME,
+    COL_TOWN_NAME,
+    DATA_URL,
+    ELEC_PATH,
+    TOWN_PATH,
+    TOWN_URL,
+)
+from scripts.data_loader import (
+    add_coordinates,
+    compute_summary,
+    read_elected_data,
+    read_summary,
+    write_summary,
+)
+from scripts.query_engine import PandasEngine, create_engine
+from scripts.search import build_search_index
+from scripts.utils import download_if_not_exists
+
+# Loading stages, in order, with the message shown while each one runs
+STAGES = [
+    ("download", "Téléchargement des données..."),
+    ("parse", "Lecture des élus..."),
+    ("merge", "Ajout des coordonnées des communes..."),
+    ("index", "Préparation des recherches et des graphiques..."),
+]
+
+# Serializes retries, so that concurrent sessions drop a failed loader once
+_retry_lock = threading.Lock()
+
+
+class DataLoader:
+    """
+    Load and enrich the dataset in a background thread.
+
+    Each stage publishes its result as soon as it completes, so the page can
+    render what is already available while the next stages run:
+
+    - summary: precomputed summary of the previous load, available at once.
+    - df: parsed elected officials, after the 'parse' stage.
+    - merged_df: officials with coordinates, after the 'merge' stage.
+    - engine, town_index, name_index: query engine and search indexes,
+      after the 'index' stage. Once an engine that does not query pandas is
+      ready, df and merged_df are released to free memory.
+    """
+
+    def __init__(self):
+        self.summary = read_summary()
+        self.df = None
+        self.merged_df = None
+        self.engine = None
+        self.town_index = None
+        self.name_index = None
+        self.completed = 0
+        self.error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        """
+        Start loading in the background.
+
+        Returns
+        -------
+        None
+        """
+        self._thread.start()
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether every stage has completed.
+        """
+        return self.completed == len(STAGES)
+
+    @property
+    def progress(self) -> float:
+        """
+        Fraction of the stages completed, between 0 and 1.
+        """
+        return self.completed / len(STAGES)
+
+    @property
+    def message(self) -> str:
+        """
+        Message describing the running stage.
+        """
+        if self.done:
+            return ""
+        return STAGES[self.completed][1]
+
+    def _run(self):
+        try:
+            download_if_not_exists(DATA_URL, ELEC_PATH)
+            download_if_not_exists(TOWN_URL, TOWN_PATH)
+            self.completed += 1
+
+            df = read_elected_data(ELEC_PATH)
+            self.summary = compute_summary(df)
+            try:
+                write_summary(self.summary)
+            except OSError as e:
+                # The summary only speeds up the next start: keep loading.
+                print(f"Summary write error: {str(e)}")
+            self.df = df
+            self.completed += 1
+
+            self.merged_df = add_coordinates(df, TOWN_PATH)
+            self.completed += 1
+
+            engine = create_engine(self.merged_df)
+            self.town_index = build_search_index(engine, COL_TOWN_NAME)
+            self.name_index = build_search_index(engine, COL_NAME)
+            self.engine = engine
+            if not isinstance(engine, PandasEngine):
+                # The engine reads its own snapshot: release the pandas copies.
+                del df
+                self.df = self.merged_df = None
+            self.completed += 1
+        except Exception as e:
+            stage = STAGES[self.completed][0]
+            self.error = f"Erreur de chargement des données ({stage}) : {str(e)}"
+
+
+def stage_completed(completed: int, stage: str) -> bool:
+    """
+    Whether a stage is among the first `completed` stages.
+
+    Parameters
+    ----------
+    completed : int
+        Number of stages completed.
+    stage : str
+        Name of the stage.
+
+    Returns
+    -------
+    bool
+        True if the stage has completed.
+    """
+    return completed > [name for name, _ in STAGES].index(stage)
+
+
+@st.cache_resource(show_spinner=False)
+def get_data_loader() -> DataLoader:
+    """
+    Return the data loader shared by every session, starting it on first use.
+
+    A failed loader stays cached until a retry drops it: see retry_failed_load.
+
+    Returns
+    -------
+    DataLoader
+        The loader, running or finished.
+    """
+    loader = DataLoader()
+    loader.start()
+    return loader
+
+
+def retry_failed_load(loader: DataLoader):
+    """
+    Drop a failed loader from the cache, so that the next run starts a new load.
+
+    The cache is only cleared while it still holds this loader: a retry from
+    another session, seeing the same failure, does not drop the new loader.
+
+    Parameters
+    ----------
+    loader : DataLoader
+        The loader that failed.
+
+    Returns
+    -------
+    None
+    """
+    with _retry_lock:
+        if get_data_loader() is loader:
+            get_data_loader.clear()
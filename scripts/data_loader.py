@@ -3,93 +3,149 @@ Author : Anthony Morin
 Description : Loading and enriching data.
 """
 
+import json
+import os
 import unicodedata
 
 import pandas as pd
-import streamlit as st
 
 from config.settings import (
     COL_CODE_TERR,
     COL_COLLEC_CODE,
     COL_DEPARTMENT_CODE,
+    COL_GENDER_CODE,
     COL_TOWN_CODE,
     DATA_URL,
-    TOWN_URL,
+    ELEC_PATH,
+    SUMMARY_PATH,
+    TOWN_PATH,
 )
 from scripts.utils import download_if_not_exists
 
 
-@st.cache_data(show_spinner=False)
-def download_and_load_data(url: str = DATA_URL) -> pd.DataFrame:
+def read_elected_data(elec_path: str = ELEC_PATH) -> pd.DataFrame:
     """
-    Download and load the dataset of elected officials from data.gouv.fr if not already cached.
+    Parse the local CSV file of elected officials.
 
     Parameters
     ----------
-    url : str, optional
-        URL to the CSV dataset of elected officials. Defaults to the DATA_URL constant.
+    elec_path : str, optional
+        Path to the downloaded CSV file. Defaults to the ELEC_PATH constant.
 
     Returns
     -------
     pd.DataFrame
-        A cleaned DataFrame with normalized column names, or an empty DataFrame if loading fails.
+        A cleaned DataFrame with normalized column names.
     """
-    elec_path = "data/elus.csv"
-    download_if_not_exists(DATA_URL, elec_path)
-    try:
-        with open(elec_path, "rb") as f:
-            df = pd.read_csv(f, sep=";", encoding="utf-8-sig", dtype=str)
-        df.columns = [normalize_column(col) for col in df.columns]
-        df[COL_CODE_TERR] = df[COL_DEPARTMENT_CODE].fillna(df[COL_COLLEC_CODE])
-        return df
-    except Exception as e:
-        st.error(f"Erreur de chargement des données des élus : {str(e)}")
-        return pd.DataFrame()
-
-
-@st.cache_data(show_spinner=False)
-def merge_coordinates_with_elec(df_elec: pd.DataFrame) -> pd.DataFrame:
+    with open(elec_path, "rb") as f:
+        df = pd.read_csv(f, sep=";", encoding="utf-8-sig", dtype=str)
+    df.columns = [normalize_column(col) for col in df.columns]
+    df[COL_CODE_TERR] = df[COL_DEPARTMENT_CODE].fillna(df[COL_COLLEC_CODE])
+    return df
+
+
+def add_coordinates(df_elec: pd.DataFrame, town_path: str = TOWN_PATH) -> pd.DataFrame:
     """
-    Merge latitude and longitude into the elected officials dataset using INSEE town codes.
+    Merge the coordinates of the local CSV file of towns into the elected officials.
 
     Parameters
     ----------
     df_elec : pd.DataFrame
         DataFrame containing elected officials with town codes.
+    town_path : str, optional
+        Path to the downloaded CSV file of towns. Defaults to the TOWN_PATH constant.
 
     Returns
     -------
     pd.DataFrame
         Merged DataFrame with 'latitude' and 'longitude' columns added.
     """
-    town_path = "data/communes.csv"
-    download_if_not_exists(TOWN_URL, town_path)
+    with open(town_path, "rb") as f:
+        town_df = pd.read_csv(f, sep=",", encoding="utf-8-sig", dtype=str)
+    town_df.columns = [normalize_column(col) for col in town_df.columns]
+    town_df = town_df.rename(columns={"code_commune_insee": COL_TOWN_CODE})
+
+    # Work on copies to keep function pure
+    df_elec = df_elec.copy()
+    town_df = town_df.copy()
+
+    # Ensure proper formatting of INSEE codes
+    df_elec[COL_TOWN_CODE] = df_elec[COL_TOWN_CODE].astype(str).str.zfill(5)
+    town_df[COL_TOWN_CODE] = town_df[COL_TOWN_CODE].astype(str).str.zfill(5)
+
+    return pd.merge(
+        df_elec,
+        town_df[[COL_TOWN_CODE, "latitude", "longitude"]],
+        on=COL_TOWN_CODE,
+        how="left",
+    )
 
-    try:
-        with open(town_path, "rb") as f:
-            town_df = pd.read_csv(f, sep=",", encoding="utf-8-sig", dtype=str)
-        town_df.columns = [normalize_column(col) for col in town_df.columns]
-        town_df = town_df.rename(columns={"code_commune_insee": COL_TOWN_CODE})
 
-        # Work on copies to keep function pure for caching
-        df_elec = df_elec.copy()
-        town_df = town_df.copy()
+def compute_summary(df: pd.DataFrame) -> dict:
+    """
+    Compute the summary metrics and sidebar options of a dataset.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The dataset containing elected officials, filtered or not.
+
+    Returns
+    -------
+    dict
+        Number of officials, number of departments, percentage of women, and
+        the territory and gender codes available as filter options.
+    """
+    return {
+        "total": len(df),
+        "departments": int(df[COL_DEPARTMENT_CODE].nunique()),
+        "pct_women": float(
+            df[COL_GENDER_CODE].value_counts(normalize=True).get("F", 0) * 100
+        ),
+        "territory_codes": sorted(df[COL_CODE_TERR].dropna().unique().tolist()),
+        "genders": df[COL_GENDER_CODE].dropna().unique().tolist(),
+    }
+
+
+def write_summary(summary: dict, path: str = SUMMARY_PATH) -> None:
+    """
+    Save a summary so the next cold start can display it before loading the data.
+
+    Parameters
+    ----------
+    summary : dict
+        Summary returned by `compute_summary`.
+    path : str, optional
+        Output path. Defaults to the SUMMARY_PATH constant.
+
+    Returns
+    -------
+    None
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False)
+
 
-        # Ensure proper formatting of INSEE codes
-        df_elec[COL_TOWN_CODE] = df_elec[COL_TOWN_CODE].astype(str).str.zfill(5)
-        town_df[COL_TOWN_CODE] = town_df[COL_TOWN_CODE].astype(str).str.zfill(5)
+def read_summary(path: str = SUMMARY_PATH) -> dict | None:
+    """
+    Read the summary saved by a previous load.
 
-        merged_df = pd.merge(
-            df_elec,
-            town_df[[COL_TOWN_CODE, "latitude", "longitude"]],
-            on=COL_TOWN_CODE,
-            how="left",
-        )
-        return merged_df
+    Parameters
+    ----------
+    path : str, optional
+        Path to the summary file. Defaults to the SUMMARY_PATH constant.
 
-    except Exception as e:
-        st.error(f"Erreur lors de la fusion avec les coordonnées :{str(e)}")
-        return df_elec
+    Returns
+    -------
+    dict or None
+        The saved summary, or None if it is missing or unreadable.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
 
 
 def normalize_column(col_name):
@@ -115,3 +171,28 @@ def normalize_column(col_name):
         .decode("utf-8")
     )
     return col_name
+
+
+def build_summary(elec_path: str = ELEC_PATH, path: str = SUMMARY_PATH) -> None:
+    """
+    Download the dataset if needed and save its summary ahead of the first start.
+
+    Without it, a fresh deployment has no summary to show until the data is parsed.
+
+    Parameters
+    ----------
+    elec_path : str, optional
+        Path to the CSV file of elected officials. Defaults to the ELEC_PATH constant.
+    path : str, optional
+        Output path. Defaults to the SUMMARY_PATH constant.
+
+    Returns
+    -------
+    None
+    """
+    download_if_not_exists(DATA_URL, elec_path)
+    write_summary(compute_summary(read_elected_data(elec_path)), path)
+
+
+if __name__ == "__main__":
+    build_summary()
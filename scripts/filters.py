@@ -5,19 +5,83 @@ Description : Applying user filters.
 
 import pandas as pd
 
-from config.settings import COL_CODE_TERR, COL_GENDER_CODE, COL_NAME, COL_TOWN_NAME
+from config.settings import COL_NAME, COL_TOWN_NAME
+from scripts.query_engine import FilterSpec, PandasEngine, QueryEngine
+from scripts.search import SimilarityIndex, normalize_text, rank_by_similarity
+
+
+def build_filter_spec(
+    departments,
+    gender,
+    town_name,
+    name,
+    town_index: SimilarityIndex | None = None,
+    name_index: SimilarityIndex | None = None,
+):
+    """
+    Turn the sidebar inputs into filter criteria for the query engines.
+
+    When a similarity index is given, the matching text input is resolved to
+    the exact values it matches, typos included, instead of a substring filter.
+
+    Parameters
+    ----------
+    departments : list or None
+        List of selected department codes to filter on (department or collectivity).
+    gender : list or None
+        List of selected gender codes to filter on ('M', 'F').
+    town_name : str
+        Text typed to search the town name.
+    name : str
+        Text typed to search the official's name.
+    town_index : SimilarityIndex, optional
+        Index over the town names.
+    name_index : SimilarityIndex, optional
+        Index over the official names.
+
+    Returns
+    -------
+    tuple
+        A 2-element tuple containing:
+        - spec (FilterSpec): Criteria to run on a query engine.
+        - scores (dict): Column names mapped to {matched value: similarity score}.
+    """
+    spec = FilterSpec(departments or [], gender or [], town_name, name)
+    scores = {}
+    # Queries without letters or digits (" ", "-") leave the column unfiltered.
+    if town_name and town_index is not None:
+        spec.town_name = ""
+        if normalize_text(town_name):
+            scores[COL_TOWN_NAME] = town_index.match(town_name)
+            spec.towns = list(scores[COL_TOWN_NAME])
+    if name and name_index is not None:
+        spec.name = ""
+        if normalize_text(name):
+            scores[COL_NAME] = name_index.match(name)
+            spec.names = list(scores[COL_NAME])
+    return spec, scores
 
 
 def apply_filters(
-    df: pd.DataFrame, departments, gender, town_name, name
+    df: pd.DataFrame | None,
+    departments,
+    gender,
+    town_name,
+    name,
+    engine: QueryEngine | None = None,
+    town_index: SimilarityIndex | None = None,
+    name_index: SimilarityIndex | None = None,
+    columns: list | None = None,
+    limit: int | None = None,
 ) -> pd.DataFrame:
     """
     Filter the elected officials dataset based on user-defined criteria.
 
     Parameters
     ----------
-    df : pd.DataFrame
-        The full dataset containing elected officials.
+    df : pd.DataFrame or None
+        The full dataset containing elected officials. Only used when no
+        engine is given.
     departments : list or None
         List of selected department codes to filter on (department or collectivity).
     gender : list or None
@@ -26,23 +90,30 @@ def apply_filters(
         Partial string to match against the town name (case-insensitive).
     name : str
         Partial string to match against the official's name (case-insensitive).
+    engine : QueryEngine, optional
+        Backend running the query. Defaults to an in-memory pandas engine over `df`.
+    town_index : SimilarityIndex, optional
+        Index over the town names, enabling typo-tolerant town search.
+    name_index : SimilarityIndex, optional
+        Index over the official names, enabling typo-tolerant name search.
+    columns : list, optional
+        Columns to return. Defaults to every column.
+    limit : int, optional
+        Maximum number of rows fetched from the engine, before ranking.
 
     Returns
     -------
     pd.DataFrame
-        A filtered DataFrame containing only rows that match the given criteria.
+        A filtered DataFrame containing only rows that match the given criteria,
+        ranked by similarity score when a text input is resolved by an index.
         If an exception occurs, an empty DataFrame is returned.
     """
     try:
-        if departments:
-            df = df[df[COL_CODE_TERR].isin(departments)]
-        if gender:
-            df = df[df[COL_GENDER_CODE].isin(gender)]
-        if town_name:
-            df = df[df[COL_TOWN_NAME].str.contains(town_name, case=False, na=False)]
-        if name:
-            df = df[df[COL_NAME].str.contains(name, case=False, na=False)]
+        engine = engine or PandasEngine(df)
+        spec, scores = build_filter_spec(
+            departments, gender, town_name, name, town_index, name_index
+        )
+        return rank_by_similarity(engine.filter(spec, columns, limit), scores)
     except Exception as e:
         print(f"Filter error: {str(e)}")
         return pd.DataFrame()
-    return df
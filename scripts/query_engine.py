@@ -0,0 +1,460 @@
+"""
+Author : Anthony Morin
+Description : Query engines running the sidebar filters and aggregations.
+"""
+
+import io
+import os
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from config.settings import (
+    COL_CODE_TERR,
+    COL_DEPARTMENT_CODE,
+    COL_GENDER_CODE,
+    COL_NAME,
+    COL_TOWN_NAME,
+    DUCKDB_MEMORY_LIMIT,
+    DUCKDB_THREADS,
+    PARQUET_PATH,
+    QUERY_ENGINE,
+)
+
+# Column holding the original DataFrame index in the Parquet snapshot
+ROW_ID = "__row_id"
+
+
+@dataclass
+class FilterSpec:
+    """
+    User-defined filter criteria shared by every query engine.
+
+    Attributes
+    ----------
+    departments : list
+        Selected department or collectivity codes.
+    gender : list
+        Selected gender codes ('M', 'F').
+    town_name : str
+        Literal substring to match against the town name (case-insensitive).
+    name : str
+        Literal substring to match against the official's name (case-insensitive).
+    towns : list or None
+        Exact town names to keep, resolved by the similarity search. None
+        disables the filter, an empty list matches nothing.
+    names : list or None
+        Exact official names to keep, resolved by the similarity search.
+    """
+
+    departments: list = field(default_factory=list)
+    gender: list = field(default_factory=list)
+    town_name: str = ""
+    name: str = ""
+    towns: list | None = None
+    names: list | None = None
+
+
+class QueryEngine:
+    """
+    Base class of the backends answering filter and group-by queries.
+
+    Every backend must return identical results for the same FilterSpec:
+    filtered rows keep the original index and order, and counts are sorted by
+    decreasing count then increasing label.
+    """
+
+    def filter(
+        self,
+        spec: FilterSpec,
+        columns: list | None = None,
+        limit: int | None = None,
+    ) -> pd.DataFrame:
+        """
+        Return the rows matching the given criteria.
+
+        Parameters
+        ----------
+        spec : FilterSpec
+            Filter criteria.
+        columns : list, optional
+            Columns to return. Defaults to every column.
+        limit : int, optional
+            Maximum number of rows to return, in the original order.
+
+        Returns
+        -------
+        pd.DataFrame
+            Matching rows, with the original index and column order.
+        """
+        raise NotImplementedError
+
+    def count(self, spec: FilterSpec) -> int:
+        """
+        Count the rows matching the given criteria.
+
+        Parameters
+        ----------
+        spec : FilterSpec
+            Filter criteria.
+
+        Returns
+        -------
+        int
+            Number of matching rows.
+        """
+        raise NotImplementedError
+
+    def count_by(
+        self,
+        spec: FilterSpec,
+        column: str,
+        fallback: str | None = None,
+        limit: int | None = None,
+    ) -> pd.Series:
+        """
+        Count the rows matching the given criteria, grouped by a column.
+
+        Parameters
+        ----------
+        spec : FilterSpec
+            Filter criteria.
+        column : str
+            Column to group on. Missing values are ignored.
+        fallback : str, optional
+            Column used where `column` is missing.
+        limit : int, optional
+            Maximum number of groups to return.
+
+        Returns
+        -------
+        pd.Series
+            Counts indexed by label, sorted by decreasing count then label.
+        """
+        raise NotImplementedError
+
+    def distinct(self, column: str) -> list:
+        """
+        Return the distinct values of a column over the whole dataset.
+
+        Parameters
+        ----------
+        column : str
+            Column to read. Missing values are ignored.
+
+        Returns
+        -------
+        list
+            Sorted distinct values.
+        """
+        raise NotImplementedError
+
+    def to_csv(self, spec: FilterSpec) -> str:
+        """
+        Export the rows matching the given criteria as CSV.
+
+        Parameters
+        ----------
+        spec : FilterSpec
+            Filter criteria.
+
+        Returns
+        -------
+        str
+            CSV text with a header line, without the index.
+        """
+        raise NotImplementedError
+
+    def summarize(self, spec: FilterSpec) -> dict:
+        """
+        Compute the summary metrics of the rows matching the given criteria.
+
+        Parameters
+        ----------
+        spec : FilterSpec
+            Filter criteria.
+
+        Returns
+        -------
+        dict
+            Number of officials, number of departments and percentage of women.
+        """
+        genders = self.count_by(spec, COL_GENDER_CODE)
+        known = genders.sum()
+        return {
+            "total": self.count(spec),
+            "departments": len(self.count_by(spec, COL_DEPARTMENT_CODE)),
+            "pct_women": float(genders.get("F", 0) / known * 100) if known else 0.0,
+        }
+
+
+class PandasEngine(QueryEngine):
+    """
+    In-memory backend running queries on a pandas DataFrame.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The full dataset containing elected officials.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+
+    def filter(self, spec, columns=None, limit=None) -> pd.DataFrame:
+        df = self._filter(spec)
+        if columns is not None:
+            df = df[columns]
+        if limit is not None:
+            df = df.head(limit)
+        return df
+
+    def count(self, spec) -> int:
+        return len(self._filter(spec))
+
+    def distinct(self, column) -> list:
+        return sorted(self.df[column].dropna().unique().tolist())
+
+    def to_csv(self, spec) -> str:
+        return self._filter(spec).to_csv(index=False)
+
+    def _filter(self, spec: FilterSpec) -> pd.DataFrame:
+        df = self.df
+        if spec.departments:
+            df = df[df[COL_CODE_TERR].isin(spec.departments)]
+        if spec.gender:
+            df = df[df[COL_GENDER_CODE].isin(spec.gender)]
+        if spec.town_name:
+            df = df[_contains(df[COL_TOWN_NAME], spec.town_name)]
+        if spec.name:
+            df = df[_contains(df[COL_NAME], spec.name)]
+        if spec.towns is not None:
+            df = df[df[COL_TOWN_NAME].isin(spec.towns)]
+        if spec.names is not None:
+            df = df[df[COL_NAME].isin(spec.names)]
+        return df
+
+    def count_by(self, spec, column, fallback=None, limit=None) -> pd.Series:
+        df = self._filter(spec)
+        labels = df[column]
+        if fallback:
+            labels = labels.fillna(df[fallback])
+        counts = labels.dropna().value_counts().rename_axis(column).reset_index()
+        counts = counts.sort_values(
+            ["count", column], ascending=[False, True], kind="mergesort"
+        )
+        return _to_series(counts, column, limit)
+
+
+class DuckDBEngine(QueryEngine):
+    """
+    SQL backend running queries with DuckDB over a local Parquet file.
+
+    Filters are pushed down to the Parquet scan so only the matching rows and
+    the requested columns are read, aggregations never leave DuckDB, and the
+    dataset is never held in pandas: only the rows asked for (capped with
+    `limit`) are returned. The number of threads and the working memory of
+    DuckDB are capped by the given settings.
+
+    Parameters
+    ----------
+    parquet_path : str
+        Path to the Parquet snapshot written by `write_parquet`.
+    threads : int, optional
+        Number of DuckDB worker threads.
+    memory_limit : str, optional
+        DuckDB working memory limit (e.g. '512MB'). Larger operations spill to
+        disk.
+    """
+
+    def __init__(
+        self,
+        parquet_path: str,
+        threads: int = DUCKDB_THREADS,
+        memory_limit: str = DUCKDB_MEMORY_LIMIT,
+    ):
+        import duckdb
+
+        self.parquet_path = parquet_path
+        self._source = "read_parquet('{}')".format(parquet_path.replace("'", "''"))
+        self._con = duckdb.connect(
+            config={"threads": threads, "memory_limit": memory_limit}
+        )
+
+    def _query(self, sql: str, params: list) -> pd.DataFrame:
+        # One cursor per query: Streamlit sessions run in concurrent threads.
+        cursor = self._con.cursor()
+        try:
+            return cursor.execute(sql, params).df()
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _where(spec: FilterSpec):
+        clauses, params = [], []
+
+        def add_in(column, values):
+            if not values:
+                clauses.append("FALSE")
+                return
+            # A single list parameter, however many values the search matched.
+            clauses.append(f'list_contains(?, "{column}")')
+            params.append(list(values))
+
+        if spec.departments:
+            add_in(COL_CODE_TERR, spec.departments)
+        if spec.gender:
+            add_in(COL_GENDER_CODE, spec.gender)
+        # Literal, case-insensitive match mirroring str.contains(regex=False).
+        if spec.town_name:
+            clauses.append(f'contains(upper("{COL_TOWN_NAME}"), upper(?))')
+            params.append(spec.town_name)
+        if spec.name:
+            clauses.append(f'contains(upper("{COL_NAME}"), upper(?))')
+            params.append(spec.name)
+        if spec.towns is not None:
+            add_in(COL_TOWN_NAME, spec.towns)
+        if spec.names is not None:
+            add_in(COL_NAME, spec.names)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def filter(self, spec, columns=None, limit=None) -> pd.DataFrame:
+        where, params = self._where(spec)
+        if columns is None:
+            selected = "*"
+        else:
+            selected = ", ".join(f'"{column}"' for column in [*columns, ROW_ID])
+        limit_sql = f"LIMIT {int(limit)}" if limit is not None else ""
+        df = self._query(
+            f"""
+            SELECT {selected} FROM {self._source} {where}
+            ORDER BY {ROW_ID} {limit_sql}
+            """,
+            params,
+        )
+        df = df.set_index(ROW_ID).rename_axis(None)
+        # DuckDB returns None for NULL strings where pandas uses NaN.
+        return df.where(df.notna(), np.nan)
+
+    def count(self, spec) -> int:
+        where, params = self._where(spec)
+        counts = self._query(
+            f"SELECT COUNT(*) AS count FROM {self._source} {where}", params
+        )
+        return int(counts["count"].iloc[0])
+
+    def distinct(self, column) -> list:
+        values = self._query(
+            f"""
+            SELECT DISTINCT "{column}" FROM {self._source}
+            WHERE "{column}" IS NOT NULL ORDER BY "{column}"
+            """,
+            [],
+        )
+        return values[column].tolist()
+
+    def to_csv(self, spec) -> str:
+        where, params = self._where(spec)
+        cursor = self._con.cursor()
+        try:
+            cursor.execute(
+                f"""
+                SELECT * EXCLUDE ({ROW_ID}) FROM {self._source} {where}
+                ORDER BY {ROW_ID}
+                """,
+                params,
+            )
+            # Convert chunk by chunk: only the CSV text is fully in memory.
+            buffer = io.StringIO()
+            columns = [description[0] for description in cursor.description]
+            pd.DataFrame(columns=columns).to_csv(buffer, index=False)
+            while not (chunk := cursor.fetch_df_chunk()).empty:
+                chunk.to_csv(buffer, index=False, header=False)
+            return buffer.getvalue()
+        finally:
+            cursor.close()
+
+    def count_by(self, spec, column, fallback=None, limit=None) -> pd.Series:
+        where, params = self._where(spec)
+        label = f'COALESCE("{column}", "{fallback}")' if fallback else f'"{column}"'
+        limit_sql = f"LIMIT {int(limit)}" if limit is not None else ""
+        counts = self._query(
+            f"""
+            SELECT label AS "{column}", COUNT(*) AS count
+            FROM (SELECT {label} AS label FROM {self._source} {where})
+            WHERE label IS NOT NULL
+            GROUP BY label
+            ORDER BY count DESC, label ASC
+            {limit_sql}
+            """,
+            params,
+        )
+        return _to_series(counts, column, limit)
+
+
+def _contains(values: pd.Series, text: str) -> pd.Series:
+    """
+    Literal, case-insensitive substring match ignoring missing values.
+    """
+    return values.str.contains(text, case=False, regex=False, na=False)
+
+
+def _to_series(counts: pd.DataFrame, column: str, limit: int | None) -> pd.Series:
+    """
+    Convert a sorted (label, count) frame into the Series returned by count_by.
+    """
+    if limit is not None:
+        counts = counts.head(limit)
+    return pd.Series(
+        counts["count"].to_numpy(dtype="int64"),
+        index=pd.Index(counts[column].to_numpy(dtype=object), name=column),
+        name="count",
+    )
+
+
+def write_parquet(df: pd.DataFrame, path: str = PARQUET_PATH) -> None:
+    """
+    Write the merged dataset to Parquet for the DuckDB backend.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The full dataset containing elected officials.
+    path : str, optional
+        Output path. Defaults to the PARQUET_PATH constant.
+
+    Returns
+    -------
+    None
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Every column is read as text: keep it typed as such even when empty.
+    snapshot = df.astype("string")
+    snapshot[ROW_ID] = df.index.to_numpy()
+    snapshot.to_parquet(path, index=False)
+
+
+def create_engine(df: pd.DataFrame, backend: str = QUERY_ENGINE) -> QueryEngine:
+    """
+    Build the query engine selected for this deployment.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        The full dataset containing elected officials.
+    backend : str, optional
+        'pandas' or 'duckdb'. Defaults to the QUERY_ENGINE constant.
+
+    Returns
+    -------
+    QueryEngine
+        The engine answering filter and aggregation queries.
+    """
+    if backend == "pandas":
+        return PandasEngine(df)
+    if backend == "duckdb":
+        write_parquet(df, PARQUET_PATH)
+        return DuckDBEngine(PARQUET_PATH)
+    raise ValueError(f"Moteur de requêtes inconnu : {backend}")
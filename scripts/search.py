@@ -0,0 +1,243 @@
+"""
+Author : Anthony Morin
+Description : Typo-tolerant search over town and official names.
+"""
+
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from functools import lru_cache
+
+import pandas as pd
+
+from config.settings import FUZZY_CACHE_SIZE, FUZZY_MAX_SUGGESTIONS, FUZZY_MIN_SCORE
+from scripts.query_engine import QueryEngine
+
+# Abbreviations expanded before matching ("St Étienne" -> "saint etienne")
+ABBREVIATIONS = {"st": "saint", "ste": "sainte", "sts": "saints", "stes": "saintes"}
+
+# Length of the q-grams used by the similarity index
+QGRAM_SIZE = 3
+
+
+def normalize_text(text) -> str:
+    """
+    Normalize a value for matching by removing accents, case, punctuation and
+    expanding common abbreviations.
+
+    Parameters
+    ----------
+    text : str
+        Raw value typed by the user or read from the dataset.
+
+    Returns
+    -------
+    str
+        Lowercase ASCII words separated by single spaces.
+    """
+    text = (
+        unicodedata.normalize("NFKD", str(text))
+        .encode("ASCII", "ignore")
+        .decode("utf-8")
+        .lower()
+    )
+    words = re.sub(r"[^a-z0-9]+", " ", text).split()
+    return " ".join(ABBREVIATIONS.get(word, word) for word in words)
+
+
+def qgrams(text: str) -> set:
+    """
+    Return the set of padded q-grams of a normalized value.
+
+    Parameters
+    ----------
+    text : str
+        Normalized value.
+
+    Returns
+    -------
+    set
+        Q-grams of length QGRAM_SIZE, padded so that word edges weigh more.
+    """
+    padded = " " * (QGRAM_SIZE - 1) + text + " "
+    return {padded[i : i + QGRAM_SIZE] for i in range(len(padded) - QGRAM_SIZE + 1)}
+
+
+class SimilarityIndex:
+    """
+    Q-gram index over the distinct normalized values of a column.
+
+    Values containing the normalized query are matched like the former
+    substring filter. Only when no value contains it, values whose Dice
+    similarity on q-grams reaches `min_score` are matched instead, so
+    misspelled queries still find results without widening correct ones.
+
+    Parameters
+    ----------
+    values : iterable
+        Raw values of the indexed column.
+    min_score : float, optional
+        Minimum similarity score of a fuzzy match.
+    """
+
+    def __init__(self, values, min_score: float = FUZZY_MIN_SCORE):
+        self.min_score = min_score
+        originals = defaultdict(list)
+        for value in values:
+            key = normalize_text(value)
+            if key:
+                originals[key].append(value)
+        self._keys = list(originals)
+        self._originals = [originals[key] for key in self._keys]
+        self._grams = [qgrams(key) for key in self._keys]
+        self._postings = defaultdict(list)
+        for i, grams in enumerate(self._grams):
+            for gram in grams:
+                self._postings[gram].append(i)
+        # Reruns repeat the same queries: memoize lookups per index.
+        self._scores = lru_cache(maxsize=FUZZY_CACHE_SIZE)(self._compute_scores)
+
+    def _compute_scores(self, query: str) -> tuple:
+        """
+        Score the indexed values against a query.
+
+        Returns
+        -------
+        tuple
+            (key id, score, is substring match) triples sorted by decreasing
+            score, restricted to substring matches and fuzzy candidates.
+        """
+        key = normalize_text(query)
+        if not key:
+            return ()
+        grams = qgrams(key)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+
+        scores = {}
+        for i, count in shared.items():
+            scores[i] = 2 * count / (len(grams) + len(self._grams[i]))
+        candidates = self._substring_candidates(key)
+        contained = {i for i in candidates if key in self._keys[i]}
+        for i in contained:
+            # Substring matches rank between 0.5 and 1, exact matches at 1.
+            dice = scores.get(i, 0.0)
+            scores[i] = 1.0 if self._keys[i] == key else (1 + dice) / 2
+
+        ranked = sorted(
+            scores.items(), key=lambda item: (-item[1], self._keys[item[0]])
+        )
+        return tuple((i, score, i in contained) for i, score in ranked)
+
+    def _substring_candidates(self, key: str) -> set:
+        """
+        Return the ids of the keys that may contain a normalized query.
+
+        A key containing the query holds every inner q-gram of the query, so
+        candidates are the intersection of their postings. Queries shorter
+        than a q-gram use the postings of every q-gram ending with them, since
+        each occurrence ends a padded q-gram.
+        """
+        inner = {
+            key[i : i + QGRAM_SIZE] for i in range(len(key) - QGRAM_SIZE + 1)
+        }
+        if not inner:
+            return set().union(
+                *(ids for gram, ids in self._postings.items() if gram.endswith(key))
+            )
+        postings = sorted((self._postings.get(gram, []) for gram in inner), key=len)
+        return set(postings[0]).intersection(*postings[1:])
+
+    def match(self, query: str) -> dict:
+        """
+        Find the raw values matching a query, with their similarity score.
+
+        Parameters
+        ----------
+        query : str
+            Text typed by the user.
+
+        Returns
+        -------
+        dict
+            Raw values mapped to their score, in decreasing score order.
+        """
+        scores = self._scores(query)
+        if any(contained for _, _, contained in scores):
+            scores = [item for item in scores if item[2]]
+        else:
+            scores = [item for item in scores if item[1] >= self.min_score]
+        return {
+            value: score for i, score, _ in scores for value in self._originals[i]
+        }
+
+    def suggest(self, query: str, limit: int = FUZZY_MAX_SUGGESTIONS) -> list:
+        """
+        Propose close values for a query that no value contains ("did you mean").
+
+        Parameters
+        ----------
+        query : str
+            Text typed by the user.
+        limit : int, optional
+            Maximum number of suggestions.
+
+        Returns
+        -------
+        list
+            Raw values of the closest matches scoring at least half of
+            `min_score`, or an empty list when the query already matches as a
+            substring.
+        """
+        scores = self._scores(query)
+        if any(contained for _, _, contained in scores):
+            return []
+        return [
+            self._originals[i][0]
+            for i, score, _ in scores[:limit]
+            if score >= self.min_score / 2
+        ]
+
+
+def build_search_index(engine: QueryEngine, column: str) -> SimilarityIndex:
+    """
+    Build the similarity index over the distinct values of a column.
+
+    Parameters
+    ----------
+    engine : QueryEngine
+        The backend reading the distinct values of the dataset.
+    column : str
+        Column to index.
+
+    Returns
+    -------
+    SimilarityIndex
+        Index answering fuzzy lookups on the column.
+    """
+    return SimilarityIndex(engine.distinct(column))
+
+
+def rank_by_similarity(df: pd.DataFrame, scores: dict) -> pd.DataFrame:
+    """
+    Sort rows by decreasing similarity of their matched columns.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Filtered dataset.
+    scores : dict
+        Column names mapped to {raw value: score} dictionaries.
+
+    Returns
+    -------
+    pd.DataFrame
+        The rows ordered by the sum of their scores. Ties keep their order.
+    """
+    if not scores or df.empty:
+        return df
+    total = sum(
+        df[column].map(values).fillna(0.0) for column, values in scores.items()
+    )
+    return df.iloc[(-total).to_numpy().argsort(kind="stable")]
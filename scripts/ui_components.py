@@ -10,9 +10,9 @@ from config.settings import (
     APP_ICON,
     APP_INITIAL_SIDEBAR_STATE,
     APP_LAYOUT,
-    COL_CODE_TERR,
-    COL_GENDER_CODE,
+    LOADER_POLL_INTERVAL,
 )
+from scripts.search import SimilarityIndex
 
 
 def setup_page():
@@ -37,14 +37,23 @@ def setup_page():
     st.title("📊 Explorateur du Répertoire National des Élus")
 
 
-def sidebar_filters(df: pd.DataFrame):
+def sidebar_filters(
+    summary: dict | None,
+    town_index: SimilarityIndex | None = None,
+    name_index: SimilarityIndex | None = None,
+):
     """
     Render sidebar filters in the Streamlit UI and return selected filter values.
 
     Parameters
     ----------
-    df : pd.DataFrame
-        The dataset used to populate filter options such as departments and gender.
+    summary : dict or None
+        Dataset summary providing the territory and gender codes, or None while
+        no summary is available yet.
+    town_index : SimilarityIndex, optional
+        Index over the town names, used to suggest corrections.
+    name_index : SimilarityIndex, optional
+        Index over the official names, used to suggest corrections.
 
     Returns
     -------
@@ -56,28 +65,138 @@ def sidebar_filters(df: pd.DataFrame):
         - name (str): Text input for filtering elected officials by name.
     """
     st.sidebar.title("🔍 Filtres")
-    # Combine unique department and collectivity codes
-    territory_codes = df[COL_CODE_TERR].dropna().unique()
-    territory_codes = sorted(territory_codes)
+    summary = summary or {}
     departments = st.sidebar.multiselect(
-        "🏙️ Département ou Collectivité", territory_codes
-    )
-    gender = st.sidebar.multiselect(
-        "👨‍⚖️👩‍⚖️ Genre :", df[COL_GENDER_CODE].dropna().unique()
+        "🏙️ Département ou Collectivité", summary.get("territory_codes", [])
     )
-    town = st.sidebar.text_input("🏘️ Commune contient :")
-    name = st.sidebar.text_input("🧑‍⚖️ Nom de l'élu contient :")
+    gender = st.sidebar.multiselect("👨‍⚖️👩‍⚖️ Genre :", summary.get("genders", []))
+    town = st.sidebar.text_input("🏘️ Commune :", key="town_query")
+    search_suggestions("town_query", town, town_index)
+    name = st.sidebar.text_input("🧑‍⚖️ Nom de l'élu :", key="name_query")
+    search_suggestions("name_query", name, name_index)
     return departments, gender, town, name
 
 
-def interactive_table(df: pd.DataFrame):
+def search_suggestions(key: str, query: str, index: SimilarityIndex | None):
+    """
+    Display "did you mean" suggestions below a sidebar text input.
+
+    Clicking a suggestion replaces the text of the input.
+
+    Parameters
+    ----------
+    key : str
+        Session state key of the text input.
+    query : str
+        Text currently typed in the input.
+    index : SimilarityIndex or None
+        Index over the searched column. Nothing is displayed without one.
+
+    Returns
+    -------
+    None
+        The suggestions are rendered as buttons in the sidebar.
+    """
+    if not query or index is None:
+        return
+    suggestions = index.suggest(query)
+    if not suggestions:
+        return
+    st.sidebar.caption("Vouliez-vous dire :")
+    for suggestion in suggestions:
+        st.sidebar.button(
+            suggestion,
+            key=f"{key}_{suggestion}",
+            on_click=_set_query,
+            args=(key, suggestion),
+        )
+
+
+def _set_query(key: str, value: str):
+    """
+    Replace the text of a sidebar input before the next rerun.
+    """
+    st.session_state[key] = value
+
+
+def summary_metrics(summary: dict | None):
+    """
+    Display the summary metrics of the dataset.
+
+    Parameters
+    ----------
+    summary : dict or None
+        Summary computed on the filtered dataset or precomputed at the previous
+        load. Placeholders are displayed when it is None.
+
+    Returns
+    -------
+    None
+        This function directly renders the metrics in the Streamlit interface.
+    """
+    col1, col2, col3 = st.columns(3)
+    if summary is None:
+        col1.metric("Élus affichés", "…")
+        col2.metric("Départements", "…")
+        col3.metric("Femmes %", "…")
+        return
+    col1.metric("Élus affichés", f"{summary['total']:,}")
+    col2.metric("Départements", summary["departments"])
+    col3.metric("Femmes %", f"{summary['pct_women']:.1f} %")
+
+
+@st.fragment(run_every=LOADER_POLL_INTERVAL)
+def loading_progress(loader, completed: int):
+    """
+    Display the progress of the background data load.
+
+    The whole page is rerun as soon as a new stage completes, so that the
+    sections depending on it are rendered.
+
+    Parameters
+    ----------
+    loader : DataLoader
+        The background data loader.
+    completed : int
+        Number of stages completed when the page was rendered.
+
+    Returns
+    -------
+    None
+        This function renders a progress bar in the Streamlit interface.
+    """
+    if loader.completed != completed or loader.error:
+        st.rerun()
+    st.progress(loader.progress, text=f"⏳ {loader.message}")
+
+
+def pending_section(message: str):
+    """
+    Display a placeholder for a section whose data is still loading.
+
+    Parameters
+    ----------
+    message : str
+        Text explaining what the section is waiting for.
+
+    Returns
+    -------
+    None
+        This function renders an information message in the Streamlit interface.
+    """
+    st.info(f"⏳ {message}")
+
+
+def interactive_table(df: pd.DataFrame, total: int | None = None):
     """
     Display the filtered results as an interactive data table in Streamlit.
 
     Parameters
     ----------
     df : pd.DataFrame
-        The filtered dataset to display.
+        The filtered dataset to display, possibly truncated.
+    total : int, optional
+        Number of matching rows, used to tell when the table is truncated.
 
     Returns
     -------
@@ -89,24 +208,25 @@ def interactive_table(df: pd.DataFrame):
     else:
         st.write("Colonnes disponibles dans le jeu de données:")
         st.write(df.columns.tolist())
+        if total is not None and len(df) < total:
+            st.caption(f"{len(df):,} premières lignes sur {total:,}.")
         st.dataframe(df, use_container_width=True)
 
 
-def download_button(df: pd.DataFrame):
+def download_button(csv: str):
     """
     Display a download button to export the filtered dataset as a CSV file.
 
     Parameters
     ----------
-    df : pd.DataFrame
-        The filtered dataset containing information about elected officials.
+    csv : str
+        The filtered dataset containing information about elected officials, as CSV.
 
     Returns
     -------
     None
         This function does not return anything. It renders a download button in the Streamlit interface.
     """
-    csv = df.to_csv(index=False)
     st.download_button(
         label="Télécharger les données complètes (CSV)",
         data=csv,
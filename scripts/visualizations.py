@@ -11,23 +11,31 @@ import streamlit as st
 from config.settings import (
     COL_COLLEC_NAME,
     COL_DEPARTMENT_NAME,
+    COL_FIRSTNAME,
     COL_GENDER_CODE,
+    COL_LAT,
+    COL_LON,
+    COL_NAME,
     COL_SOCIOPRO_LABEL,
+    COL_TOWN_NAME,
     MAP_RADIUS,
     MAP_ZOOM,
     MAP_RADIUS_MIN_PX,
     MAP_RADIUS_MAX_PX,
 )
+from scripts.query_engine import FilterSpec, QueryEngine
 
 
-def gender_distribution_chart(df: pd.DataFrame) -> None:
+def gender_distribution_chart(engine: QueryEngine, filters: FilterSpec) -> None:
     """
     Display a pie chart showing gender distribution among elected officials.
 
     Parameters
     ----------
-    df : pd.DataFrame
-        The dataset containing a column with gender codes.
+    engine : QueryEngine
+        The backend running the aggregation on the dataset.
+    filters : FilterSpec
+        The user-defined filter criteria.
 
     Returns
     -------
@@ -35,10 +43,8 @@ def gender_distribution_chart(df: pd.DataFrame) -> None:
         The chart is rendered directly in the Streamlit interface.
     """
     try:
-        gender_counts = (
-            df[COL_GENDER_CODE]
-            .value_counts()
-            .rename(index={"F": "Femmes", "M": "Hommes"})
+        gender_counts = engine.count_by(filters, COL_GENDER_CODE).rename(
+            index={"F": "Femmes", "M": "Hommes"}
         )
         fig = px.pie(
             names=gender_counts.index,
@@ -51,15 +57,17 @@ def gender_distribution_chart(df: pd.DataFrame) -> None:
         st.error(f"Erreur d'affichage du graphique par genre : {str(e)}")
 
 
-def department_mayor_count_chart(df: pd.DataFrame) -> None:
+def department_mayor_count_chart(engine: QueryEngine, filters: FilterSpec) -> None:
     """
     Display a horizontal scrollable bar chart showing the number of mayors per
     department or collectivity.
 
     Parameters
     ----------
-    df : pd.DataFrame
-        The dataset containing a column with department or collectivity names.
+    engine : QueryEngine
+        The backend running the aggregation on the dataset.
+    filters : FilterSpec
+        The user-defined filter criteria.
 
     Returns
     -------
@@ -67,12 +75,10 @@ def department_mayor_count_chart(df: pd.DataFrame) -> None:
         The bar chart is rendered in the Streamlit interface.
     """
     try:
-        # Create a unified label column combining department or collectivity names
-        df = df.copy()
-        df["territoire_label"] = df[COL_DEPARTMENT_NAME].fillna(df[COL_COLLEC_NAME])
-
-        # Count mayors by this label
-        dept_counts = df["territoire_label"].value_counts().sort_values(ascending=False)
+        # Count mayors by department name, falling back on the collectivity name
+        dept_counts = engine.count_by(
+            filters, COL_DEPARTMENT_NAME, fallback=COL_COLLEC_NAME
+        )
 
         fig = px.bar(
             x=dept_counts.index,
@@ -89,16 +95,17 @@ def department_mayor_count_chart(df: pd.DataFrame) -> None:
         st.error(f"Erreur lors de l'affichage des maires : {str(e)}")
 
 
-def profession_analysis_chart(df: pd.DataFrame) -> None:
+def profession_analysis_chart(engine: QueryEngine, filters: FilterSpec) -> None:
     """
     Displays a horizontal scrollable bar chart of the top 15 most represented
     socio-professional categories among elected officials.
 
     Parameters
     ----------
-    df : pd.DataFrame
-        DataFrame containing a column which holds socio-professional
-        category labels.
+    engine : QueryEngine
+        The backend running the aggregation on the dataset.
+    filters : FilterSpec
+        The user-defined filter criteria.
 
     Returns
     -------
@@ -108,7 +115,7 @@ def profession_analysis_chart(df: pd.DataFrame) -> None:
     """
     try:
         # Get profession counts
-        profession_counts = df[COL_SOCIOPRO_LABEL].dropna().value_counts().head(15)
+        profession_counts = engine.count_by(filters, COL_SOCIOPRO_LABEL, limit=15)
 
         # Create bar chart
         fig = px.bar(
@@ -132,6 +139,18 @@ def profession_analysis_chart(df: pd.DataFrame) -> None:
         st.error(f"Erreur lors de l'affichage des CSP : {str(e)}")
 
 
+# Columns read by the map layer and its tooltip
+MAP_COLUMNS = [
+    COL_FIRSTNAME,
+    COL_NAME,
+    COL_TOWN_NAME,
+    COL_DEPARTMENT_NAME,
+    COL_GENDER_CODE,
+    COL_LAT,
+    COL_LON,
+]
+
+
 def mayors_map(df: pd.DataFrame) -> None:
     """
     Display a geospatial map showing the location of mayors based on latitude and longitude.
@@ -0,0 +1,196 @@
+"""
+Author : Anthony Morin
+Description : Shared test suite checking that every query engine returns identical results.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config.settings import (
+    COL_CODE_TERR,
+    COL_COLLEC_NAME,
+    COL_DEPARTMENT_CODE,
+    COL_DEPARTMENT_NAME,
+    COL_GENDER_CODE,
+    COL_NAME,
+    COL_SECTOR,
+    COL_SOCIOPRO_LABEL,
+    COL_TOWN_NAME,
+)
+from scripts.query_engine import DuckDBEngine, FilterSpec, PandasEngine, write_parquet
+
+pytest.importorskip("duckdb")
+
+
+@pytest.fixture(scope="module")
+def df():
+    """
+    Small dataset mimicking the merged elected officials, with missing values.
+    """
+    return pd.DataFrame(
+        {
+            COL_CODE_TERR: ["42", "42", "75", "ZA", "ZB", "13", np.nan],
+            COL_DEPARTMENT_CODE: ["42", "42", "75", np.nan, np.nan, "13", np.nan],
+            COL_DEPARTMENT_NAME: [
+                "Loire",
+                "Loire",
+                "Paris",
+                np.nan,
+                np.nan,
+                "Bouches-du-Rhône",
+                np.nan,
+            ],
+            COL_COLLEC_NAME: [
+                np.nan,
+                np.nan,
+                np.nan,
+                "Martinique",
+                "Guyane",
+                np.nan,
+                np.nan,
+            ],
+            COL_GENDER_CODE: ["M", "F", "F", "M", "F", "M", np.nan],
+            COL_TOWN_NAME: [
+                "Saint-Étienne",
+                "Saint-Étienne-de-Tinée",
+                "Paris",
+                "Fort-de-France",
+                "Cayenne",
+                "Marseille",
+                np.nan,
+            ],
+            COL_NAME: [
+                "DUPONT",
+                "Durand (fils)",
+                "Martin",
+                "Éloi",
+                "Dupont",
+                "Bernard",
+                "Petit",
+            ],
+            COL_SOCIOPRO_LABEL: [
+                "Agriculteurs",
+                "Cadres",
+                "Cadres",
+                "Retraités",
+                np.nan,
+                "Agriculteurs",
+                "Cadres",
+            ],
+            "latitude": ["45.43", "44.2", "48.85", np.nan, "4.93", "43.29", np.nan],
+            COL_SECTOR: pd.Series([np.nan] * 7, dtype=object),
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def engines(df, tmp_path_factory):
+    """
+    Build every engine over the same dataset.
+    """
+    path = str(tmp_path_factory.mktemp("data") / "elus.parquet")
+    write_parquet(df, path)
+    return PandasEngine(df), DuckDBEngine(path, threads=2, memory_limit="64MB")
+
+
+FILTER_CASES = {
+    "no filter": (FilterSpec(), 7),
+    "departments": (FilterSpec(departments=["42", "ZA"]), 3),
+    "gender": (FilterSpec(gender=["F"]), 3),
+    "accented town, other case": (FilterSpec(town_name="ÉTIENNE"), 2),
+    "name, other case": (FilterSpec(name="dupont"), 2),
+    "name with regex characters": (FilterSpec(name="(fils)"), 1),
+    "dot is literal": (FilterSpec(name="."), 0),
+    "empty result": (FilterSpec(departments=["75"], gender=["M"]), 0),
+    "towns": (FilterSpec(towns=["Paris", "Cayenne"]), 2),
+    "empty towns match nothing": (FilterSpec(towns=[]), 0),
+    "names and gender": (FilterSpec(gender=["M"], names=["DUPONT", "Petit"]), 1),
+}
+
+COUNT_CASES = {
+    "gender": (FilterSpec(), dict(column=COL_GENDER_CODE)),
+    "collectivity fallback": (
+        FilterSpec(),
+        dict(column=COL_DEPARTMENT_NAME, fallback=COL_COLLEC_NAME),
+    ),
+    "limit": (FilterSpec(), dict(column=COL_SOCIOPRO_LABEL, limit=2)),
+    "empty column": (FilterSpec(), dict(column=COL_SECTOR)),
+    "fallback on empty column": (
+        FilterSpec(),
+        dict(column=COL_SECTOR, fallback=COL_DEPARTMENT_NAME),
+    ),
+    "filtered": (FilterSpec(gender=["F"]), dict(column=COL_SOCIOPRO_LABEL)),
+    "empty result": (
+        FilterSpec(departments=["75"], gender=["M"]),
+        dict(column=COL_GENDER_CODE),
+    ),
+    "empty towns": (FilterSpec(towns=[]), dict(column=COL_GENDER_CODE)),
+}
+
+
+@pytest.mark.parametrize(
+    "spec, expected_rows", FILTER_CASES.values(), ids=FILTER_CASES
+)
+def test_filter_matches_across_engines(engines, spec, expected_rows):
+    pandas_engine, duckdb_engine = engines
+    expected = pandas_engine.filter(spec)
+    assert len(expected) == expected_rows
+    pd.testing.assert_frame_equal(duckdb_engine.filter(spec), expected)
+    assert duckdb_engine.count(spec) == pandas_engine.count(spec) == expected_rows
+    assert duckdb_engine.to_csv(spec) == pandas_engine.to_csv(spec)
+    assert duckdb_engine.summarize(spec) == pandas_engine.summarize(spec)
+
+
+@pytest.mark.parametrize("limit", [None, 0, 2, 100])
+def test_filter_columns_and_limit_match_across_engines(engines, limit):
+    pandas_engine, duckdb_engine = engines
+    spec, columns = FilterSpec(gender=["M", "F"]), [COL_NAME, "latitude"]
+    expected = pandas_engine.filter(spec, columns=columns, limit=limit)
+    assert list(expected.columns) == columns
+    pd.testing.assert_frame_equal(
+        duckdb_engine.filter(spec, columns=columns, limit=limit), expected
+    )
+
+
+@pytest.mark.parametrize("column", [COL_TOWN_NAME, COL_CODE_TERR])
+def test_distinct_matches_across_engines(engines, column):
+    pandas_engine, duckdb_engine = engines
+    assert duckdb_engine.distinct(column) == pandas_engine.distinct(column)
+
+
+@pytest.mark.parametrize("spec, kwargs", COUNT_CASES.values(), ids=COUNT_CASES)
+def test_count_by_matches_across_engines(engines, spec, kwargs):
+    pandas_engine, duckdb_engine = engines
+    expected = pandas_engine.count_by(spec, **kwargs)
+    pd.testing.assert_series_equal(duckdb_engine.count_by(spec, **kwargs), expected)
+
+
+def test_count_by_orders_by_count_then_label(engines):
+    pandas_engine, _ = engines
+    counts = pandas_engine.count_by(
+        FilterSpec(), COL_DEPARTMENT_NAME, fallback=COL_COLLEC_NAME
+    )
+    assert counts.to_dict() == {
+        "Loire": 2,
+        "Bouches-du-Rhône": 1,
+        "Guyane": 1,
+        "Martinique": 1,
+        "Paris": 1,
+    }
+    assert list(counts.index) == list(counts.to_dict())
+
+
+def test_summarize(engines):
+    pandas_engine, _ = engines
+    assert pandas_engine.summarize(FilterSpec(departments=["42", "75"])) == {
+        "total": 3,
+        "departments": 2,
+        "pct_women": pytest.approx(200 / 3),
+    }
+
+
+def test_count_by_limit(engines):
+    pandas_engine, _ = engines
+    counts = pandas_engine.count_by(FilterSpec(), COL_SOCIOPRO_LABEL, limit=2)
+    assert counts.to_dict() == {"Cadres": 3, "Agriculteurs": 2}
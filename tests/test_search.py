@@ -0,0 +1,77 @@
+"""
+Author : Anthony Morin
+Description : Tests of the typo-tolerant search.
+"""
+
+import pytest
+
+from scripts.filters import build_filter_spec
+from scripts.search import SimilarityIndex, normalize_text
+
+TOWNS = [
+    "Saint-Étienne",
+    "Saint-Étienne-de-Tinée",
+    "Paris",
+    "Saint-Denis",
+    "Saint-Vienne",
+    "Sainte-Anne",
+    "Saint-Julien",
+    "Étienville",
+    "Marseille",
+    "Aix-en-Provence",
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return SimilarityIndex(TOWNS)
+
+
+def test_normalize_text_expands_abbreviations():
+    assert normalize_text("St Étienne") == normalize_text("SAINT-ETIENNE")
+
+
+def test_match_ranks_exact_match_first(index):
+    matches = index.match("St Étienne")
+    assert list(matches)[:2] == ["Saint-Étienne", "Saint-Étienne-de-Tinée"]
+    assert matches["Saint-Étienne"] == 1.0
+
+
+def test_correct_query_does_not_match_similar_values(index):
+    assert set(index.match("Saint-Étienne")) == {
+        "Saint-Étienne",
+        "Saint-Étienne-de-Tinée",
+    }
+    names = SimilarityIndex(["Dupont", "Dumont", "Martin", "Marin"])
+    assert set(names.match("Dupont")) == {"Dupont"}
+    assert set(names.match("Martin")) == {"Martin"}
+
+
+def test_match_tolerates_typos(index):
+    assert "Marseille" in index.match("Marsielle")
+    assert "Saint-Étienne" in index.match("Sant-Etiene")
+
+
+@pytest.mark.parametrize("query", ["e", "ai", "ien", "saint e", "provence", "xyz"])
+def test_substring_matches_equal_full_scan(index, query):
+    key = normalize_text(query)
+    expected = {town for town in TOWNS if key in normalize_text(town)}
+    contained = {
+        index._originals[i][0]
+        for i, _, is_contained in index._scores(query)
+        if is_contained
+    }
+    assert contained == expected
+
+
+def test_suggest_only_without_substring_match(index):
+    assert index.suggest("Marsielle") == ["Marseille"]
+    assert index.suggest("pari") == []
+
+
+@pytest.mark.parametrize("query", [" ", "-", "'"])
+def test_query_without_letters_applies_no_filter(index, query):
+    spec, scores = build_filter_spec([], [], query, "", town_index=index)
+    assert spec.towns is None
+    assert spec.town_name == ""
+    assert scores == {}